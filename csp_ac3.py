@@ -6,29 +6,73 @@ def ac3(csp):
     :param csp: A dictionary with 'variables', 'domains', and 'constraints'
     :return: True if arc consistent, False if any domain is empty
     """
-    queue = deque([(xi, xj) for xi in csp['variables'] for xj in csp['neighbors'][xi]])
+    # Rebuilt on every call: the domains may have changed since the last one
+    # Arcs without a real constraint (support None) are never queued
+    support = precompute_arcs(csp)
+    queue = deque([arc for arc, allowed in support.items() if allowed is not None])
+    in_queue = set(queue)  # arcs already waiting are not queued twice
 
     while queue:
         xi, xj = queue.popleft()
-        if revise(csp, xi, xj):
+        in_queue.discard((xi, xj))
+        if revise(csp, xi, xj, support[(xi, xj)]):
             if not csp['domains'][xi]:
                 return False  # Domain wiped out
             for xk in csp['neighbors'][xi]:
-                if xk != xj:
+                if xk == xj or (xk, xi) in in_queue:
+                    continue
+                if (xk, xi) not in support:  # neighbor lists need not be symmetric
+                    support[(xk, xi)] = arc_support(csp, xk, xi)
+                if support[(xk, xi)] is not None:
                     queue.append((xk, xi))
+                    in_queue.add((xk, xi))
     return True
 
-def revise(csp, xi, xj):
+def precompute_arcs(csp):
+    """
+    Evaluate the constraint once for every value pair of every arc of the
+    current domains, so revise only needs set lookups instead of calls.
+    :return: {(xi, xj): arc_support(csp, xi, xj)} for every arc
+    """
+    return {
+        (xi, xj): arc_support(csp, xi, xj)
+        for xi in csp['variables']
+        for xj in csp['neighbors'][xi]
+    }
+
+def arc_support(csp, xi, xj):
+    """
+    :return: {x: set of y in Dj compatible with x} for every x in Di,
+             or None when every pair is allowed: such an arc never prunes
+    """
+    constraints = csp['constraints']
+    Dj = csp['domains'][xj]
+    support = {
+        x: {y for y in Dj if constraints(xi, x, xj, y)}
+        for x in csp['domains'][xi]
+    }
+    if all(len(ys) == len(set(Dj)) for ys in support.values()):
+        return None
+    return support
+
+def revise(csp, xi, xj, support=None):
     """
     Revise domain of xi to enforce consistency with xj.
+    :param support: arc_support(csp, xi, xj) if already computed
     :return: True if domain of xi was revised
     """
-    revised = False
-    for x in csp['domains'][xi][:]:
-        if not any(csp['constraints'](xi, x, xj, y) for y in csp['domains'][xj]):
-            csp['domains'][xi].remove(x)
-            revised = True
-    return revised
+    if support is None:
+        support = arc_support(csp, xi, xj)
+        if support is None:
+            return False  # no real constraint between xi and xj
+    Di = csp['domains'][xi]
+    Dj = csp['domains'][xj]
+    # Keep x if some value still left in Dj supports it
+    new = [x for x in Di if not support[x].isdisjoint(Dj)]
+    if len(new) != len(Di):
+        csp['domains'][xi] = new
+        return True
+    return False
 
 # Example CSP: 3 variables with binary inequality constraints
 # csp = {
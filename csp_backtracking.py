@@ -1,4 +1,20 @@
-from typing import Dict, List, Optional, Any, Tuple
+import heapq
+import multiprocessing
+import sys
+from collections import deque
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Callable, Deque, Dict, Iterator, List, Mapping, Optional, Any, Tuple
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:  # run the same kernel as plain Python
+    np = None
+
+    def njit(**kwargs):
+        return lambda func: func
+
 
 # ==================================================
 # CSP BACKTRACKING SOLVER (with Forward Checking)
@@ -13,40 +29,104 @@ class CSP:
         constraints: List[Tuple[Any, Any]],
     ):
         self.variables = variables
-        self.domains = domains  # {var: [possible values]}
+        # Each domain is an int bitmask: bit i set iff self.values[i] is possible
+        self.values = list(
+            dict.fromkeys(val for dom in domains.values() for val in dom)
+        )
+        self.bits = {val: 1 << i for i, val in enumerate(self.values)}
+        self.domains = {
+            var: sum(self.bits[val] for val in set(dom))
+            for var, dom in domains.items()
+        }  # {var: bitmask of possible values}
         self.constraints = (
             constraints  # List of (var1, var2) pairs that must differ or satisfy a rule
         )
         self.neighbors = self._build_neighbors()  # {var: [vars constrained with it]}
+        # Large problems pick MRV variables from buckets indexed by domain size
+        # instead of scanning every variable. Each bucket is a heap of
+        # declaration indices, so ties break like min(); stale entries are
+        # skipped lazily and purged when a bucket grows past 2 * len(variables)
+        self._size_buckets: Optional[List[List[int]]] = None
+        if len(variables) > 100:
+            self._index = {var: i for i, var in enumerate(variables)}
+            self._size_buckets = [[] for _ in range(len(self.values) + 1)]
+            for var in variables:
+                self._track_size(var)
 
     def _build_neighbors(self) -> Dict[Any, List[Any]]:
-        neighbors = {var: [] for var in self.variables}
+        # dict keys act as an insertion-ordered set: overlapping constraints
+        # (e.g. same row and same box) must not list a neighbor twice
+        neighbors = {var: {} for var in self.variables}
         for v1, v2 in self.constraints:
-            neighbors[v1].append(v2)
-            neighbors[v2].append(v1)
-        return neighbors
-
-
-def backtrack(assignment: Dict[Any, Any], csp: CSP) -> Optional[Dict[Any, Any]]:
-    # Base case: if assignment is complete
-    if len(assignment) == len(csp.variables):
-        return assignment
-
-    # Select unassigned variable (using MRV heuristic)
-    var = select_unassigned_variable(assignment, csp)
-    for value in domain_values(var, assignment, csp):
-        if is_consistent(var, value, assignment, csp):
-            # Make assignment
-            assignment[var] = value
-            inferences = forward_checking(var, value, assignment, csp)
-            if inferences is not None:
-                result = backtrack(assignment, csp)
-                if result is not None:
-                    return result
-            # Undo assignment and inferences
-            remove_inference(var, value, inferences, assignment, csp)
-            del assignment[var]
-    return None  # failure
+            neighbors[v1][v2] = None
+            neighbors[v2][v1] = None
+        return {var: list(adjacent) for var, adjacent in neighbors.items()}
+
+    def _track_size(self, var: Any):
+        """Record var under its current domain size (only if buckets are on)"""
+        size = self.domains[var].bit_count()
+        bucket = self._size_buckets[size]
+        heapq.heappush(bucket, self._index[var])
+        if len(bucket) > 2 * len(self.variables):
+            # Keep one entry per variable still of this size (a sorted list is
+            # a valid heap); assigned variables keep their size, so at most
+            # len(variables) entries survive
+            bucket[:] = sorted(
+                {
+                    i
+                    for i in bucket
+                    if self.domains[self.variables[i]].bit_count() == size
+                }
+            )
+
+
+def backtrack(
+    assignment: Dict[Any, Any],
+    csp: CSP,
+    inference: Optional[Callable] = None,
+) -> Optional[Dict[Any, Any]]:
+    """
+    Depth-first search driven by an explicit stack of
+    (var, value iterator, inferences) frames instead of recursion,
+    so deep problems never hit the interpreter's recursion limit.
+    'inference' defaults to forward_checking; pass mac for full
+    arc consistency after every assignment.
+    """
+    if inference is None:
+        inference = forward_checking
+    stack = []
+    while True:
+        # Base case: if assignment is complete
+        if len(assignment) == len(csp.variables):
+            return assignment
+
+        # Select unassigned variable (using MRV heuristic)
+        var = select_unassigned_variable(assignment, csp)
+        stack.append((var, iter(domain_values(var, assignment, csp)), None))
+
+        # Assign the next value of the deepest frame, backing up when exhausted
+        while stack:
+            var, values, inferences = stack[-1]
+            if var in assignment:
+                # Undo the previous attempt's assignment and inferences
+                remove_inference(var, assignment[var], inferences, assignment, csp)
+                del assignment[var]
+            for value in values:
+                # Forward checking keeps every remaining value consistent
+                assignment[var] = value
+                inferences = inference(var, value, assignment, csp)
+                if inferences is not None:
+                    break
+                del assignment[var]
+            else:
+                stack.pop()
+                if csp._size_buckets is not None:
+                    csp._track_size(var)  # unassigned again, so selectable again
+                continue
+            stack[-1] = (var, values, inferences)
+            break
+        else:
+            return None  # failure
 
 
 # ========================================
@@ -56,51 +136,141 @@ def backtrack(assignment: Dict[Any, Any], csp: CSP) -> Optional[Dict[Any, Any]]:
 
 def select_unassigned_variable(assignment: Dict, csp: CSP) -> Any:
     """MRV Heuristic: Minimum Remaining Values"""
+    if csp._size_buckets is not None:
+        for size, bucket in enumerate(csp._size_buckets):
+            while bucket:
+                var = csp.variables[bucket[0]]
+                if var not in assignment and csp.domains[var].bit_count() == size:
+                    return var
+                heapq.heappop(bucket)  # stale: assigned or domain size changed
     unassigned = [v for v in csp.variables if v not in assignment]
-    return min(unassigned, key=lambda var: len(csp.domains[var]))
+    return min(unassigned, key=lambda var: csp.domains[var].bit_count())
+
+
+def lex_values(var: Any, assignment: Dict, csp: CSP) -> Iterator[Any]:
+    """Yield current domain values (may be pruned by forward checking)"""
+    mask = csp.domains[var]
+    while mask:
+        lsb = mask & -mask
+        mask ^= lsb
+        yield csp.values[lsb.bit_length() - 1]
 
 
 def domain_values(var: Any, assignment: Dict, csp: CSP) -> List[Any]:
-    """Return current domain (may be pruned by forward checking)"""
-    return csp.domains[var]
+    """
+    LCV Heuristic: Least Constraining Value first, i.e. values that
+    remove the fewest options from unassigned neighbors' domains
+    """
+    unassigned = [csp.domains[n] for n in csp.neighbors[var] if n not in assignment]
 
+    def cost(value: Any) -> int:
+        bit = csp.bits[value]
+        return sum(1 for mask in unassigned if mask & bit)
 
-def is_consistent(var: Any, value: Any, assignment: Dict, csp: CSP) -> bool:
-    """Check if value for var is consistent with current assignment"""
-    for neighbor in csp.neighbors[var]:
-        if neighbor in assignment and assignment[neighbor] == value:
-            return False
-    return True
+    return sorted(lex_values(var, assignment, csp), key=cost)
 
 
 def forward_checking(
     var: Any, value: Any, assignment: Dict, csp: CSP
-) -> Optional[Dict[Any, List[Any]]]:
+) -> Optional[List[Tuple[Any, int]]]:
     """
     Remove 'value' from domains of unassigned neighbors.
-    Return a dict of {neighbor: [removed values]} or None if conflict.
+    Return a list of (neighbor, old domain mask) or None if conflict.
     """
-    removed = {}
+    bit = csp.bits[value]
+    removed = []
     for neighbor in csp.neighbors[var]:
-        if neighbor not in assignment and value in csp.domains[neighbor]:
-            csp.domains[neighbor].remove(value)
-            removed[neighbor] = [value]
-            if len(csp.domains[neighbor]) == 0:
-                return None  # conflict
-    return removed if removed else {}
+        if neighbor not in assignment:
+            mask = csp.domains[neighbor]
+            if mask & bit:
+                removed.append((neighbor, mask))
+                mask &= ~bit
+                csp.domains[neighbor] = mask
+                if csp._size_buckets is not None:
+                    csp._track_size(neighbor)
+                if mask == 0:
+                    remove_inference(var, value, removed, assignment, csp)
+                    return None  # conflict
+    return removed
+
+
+def ac3_binary(
+    csp: CSP,
+    assignment: Optional[Dict] = None,
+    queue: Optional[Deque[Tuple[Any, Any]]] = None,
+    removed: Optional[List[Tuple[Any, int]]] = None,
+) -> bool:
+    """
+    AC-3 (as in csp_ac3.py) for the 'must differ' constraints of a CSP.
+    Revising arc (xi, xj) can only prune when xj is down to one value,
+    which is then removed from xi. Starts from every arc unless 'queue'
+    is given; old masks are appended to 'removed' for remove_inference.
+    Return False if a domain is wiped out.
+    """
+    if assignment is None:
+        assignment = {}
+    if queue is None:
+        queue = deque((xi, xj) for xi in csp.variables for xj in csp.neighbors[xi])
+    while queue:
+        xi, xj = queue.popleft()
+        if xi in assignment:
+            continue
+        if xj in assignment:
+            single = csp.bits[assignment[xj]]
+        else:
+            single = csp.domains[xj]
+            if single & (single - 1):
+                continue  # two or more values left: every x in Di is supported
+        mask = csp.domains[xi]
+        if mask & single:
+            if removed is not None:
+                removed.append((xi, mask))
+            mask &= ~single
+            csp.domains[xi] = mask
+            if csp._size_buckets is not None:
+                csp._track_size(xi)
+            if mask == 0:
+                return False  # Domain wiped out
+            if mask & (mask - 1) == 0:
+                # xi is now down to one value: it may prune its neighbors
+                queue.extend((xk, xi) for xk in csp.neighbors[xi] if xk != xj)
+    return True
+
+
+def mac(
+    var: Any, value: Any, assignment: Dict, csp: CSP
+) -> Optional[List[Tuple[Any, int]]]:
+    """
+    Maintain Arc Consistency: forward checking, then AC-3 over the arcs
+    into each neighbor that forward checking left with a single value.
+    Return the same (neighbor, old mask) list or None if conflict.
+    """
+    removed = forward_checking(var, value, assignment, csp)
+    if removed is None:
+        return None
+    queue = deque(
+        (xk, xi)
+        for xi, _ in removed
+        if csp.domains[xi] & (csp.domains[xi] - 1) == 0
+        for xk in csp.neighbors[xi]
+        if xk != var
+    )
+    if not ac3_binary(csp, assignment, queue, removed):
+        remove_inference(var, value, removed, assignment, csp)
+        return None
+    return removed
 
 
 def remove_inference(
-    var: Any, value: Any, inferences: Dict, assignment: Dict, csp: CSP
+    var: Any, value: Any, inferences: List, assignment: Dict, csp: CSP
 ):
     """Restore domains after backtracking"""
     if inferences is None:
         return
-    for neighbor, values in inferences.items():
-        for val in values:
-            if val not in csp.domains[neighbor]:
-                csp.domains[neighbor].append(val)
-        csp.domains[neighbor].sort()  # optional: keep ordered
+    for neighbor, mask in reversed(inferences):
+        csp.domains[neighbor] = mask
+        if csp._size_buckets is not None:
+            csp._track_size(neighbor)
 
 
 # ========================================
@@ -108,8 +278,8 @@ def remove_inference(
 # ========================================
 
 
-def solve_sudoku(grid: List[List[int]]) -> Optional[List[List[int]]]:
-    """Convert 9x9 Sudoku grid to CSP and solve"""
+def sudoku_csp(grid: List[List[int]]) -> CSP:
+    """Convert 9x9 Sudoku grid to a generic CSP"""
     variables = [(i, j) for i in range(9) for j in range(9)]
     domains = {}
 
@@ -121,34 +291,432 @@ def solve_sudoku(grid: List[List[int]]) -> Optional[List[List[int]]]:
             else:
                 domains[(i, j)] = list(range(1, 10))
 
-    # Constraints: row, column, 3x3 box
-    constraints = []
-    # Row & column
-    for i in range(9):
-        for j1 in range(9):
-            for j2 in range(j1 + 1, 9):
-                constraints.append(((i, j1), (i, j2)))  # same row
-                constraints.append(((j1, i), (j2, i)))  # same col
-
-    # 3x3 boxes
-    for box_i in range(0, 9, 3):
-        for box_j in range(0, 9, 3):
-            cells = [(box_i + di, box_j + dj) for di in range(3) for dj in range(3)]
-            for k1 in range(len(cells)):
-                for k2 in range(k1 + 1, len(cells)):
-                    constraints.append((cells[k1], cells[k2]))
-
-    csp = CSP(variables, domains, constraints)
-
-    solution = backtrack({}, csp)
-    if solution is None:
+    csp = CSP(variables, domains, [])
+    csp.neighbors = _sudoku_neighbors()  # shared and read-only
+    return csp
+
+
+@lru_cache(maxsize=None)
+def _sudoku_neighbors() -> Mapping[Tuple[int, int], Tuple[Tuple[int, int], ...]]:
+    """
+    Neighbors: same row, column or 3x3 box, read off SUDOKU_PEERS rather
+    than expanding 972 pairwise constraints first. The structure is the
+    same for every puzzle, so it is built once and shared read-only.
+    """
+    return MappingProxyType(
+        {
+            (cell // 9, cell % 9): tuple(
+                (int(peer) // 9, int(peer) % 9) for peer in SUDOKU_PEERS[cell]
+            )
+            for cell in range(81)
+        }
+    )
+
+
+def _int_array(values: List) -> Any:
+    """int32 array when Numba is available, plain list otherwise"""
+    if np is None:
+        return list(values)
+    return np.array(values, dtype=np.int32)
+
+
+def _build_sudoku_units() -> List[List[int]]:
+    """The 27 AllDifferent groups (9 rows, 9 columns, 9 boxes) of cells 9*i + j"""
+    rows = [[9 * i + j for j in range(9)] for i in range(9)]
+    cols = [[9 * i + j for i in range(9)] for j in range(9)]
+    boxes = [
+        [9 * (box_i + di) + box_j + dj for di in range(3) for dj in range(3)]
+        for box_i in range(0, 9, 3)
+        for box_j in range(0, 9, 3)
+    ]
+    return rows + cols + boxes
+
+
+def _build_sudoku_peers(units: List[List[int]]) -> List[Tuple[int, ...]]:
+    """For each cell, the 20 cells sharing its row, column or box"""
+    peers = []
+    for cell in range(81):
+        same = {other for unit in units if cell in unit for other in unit}
+        same.discard(cell)
+        peers.append(tuple(sorted(same)))
+    return peers
+
+
+# Sudoku structure never changes, so its tables are built once:
+# 27 x 9 units, 81 x 3 units of each cell and 81 x 20 peers
+_units = _build_sudoku_units()
+SUDOKU_UNITS = _int_array(_units)
+SUDOKU_CELL_UNITS = _int_array(
+    [[u for u in range(27) if cell in _units[u]] for cell in range(81)]
+)
+SUDOKU_PEERS = _int_array(_build_sudoku_peers(_units))
+FULL_MASK = 0b111111111  # digits 1..9 -> bits 0..8
+VALUE_LOW, VALUE_HIGH, VALUE_RANDOM = 0, 1, 2  # value orders for _solve
+
+
+@njit(cache=True)
+def _popcount(mask):
+    """SWAR bit count of a mask of up to 16 bits (lowers to plain ALU ops)"""
+    mask = mask - ((mask >> 1) & 0x5555)
+    mask = (mask & 0x3333) + ((mask >> 2) & 0x3333)
+    mask = (mask + (mask >> 4)) & 0x0F0F
+    return (mask + (mask >> 8)) & 0x1F
+
+
+if np is None:
+    # Interpreted, the SWAR steps cost ~10x a single C-level bit count
+    _popcount = int.bit_count
+
+
+@njit(cache=True)
+def _hidden_singles(dom, assigned, unit, trail, top):
+    """
+    AllDifferent propagation on one unit: a digit that fits only one
+    unassigned cell is forced there, and a digit that fits nowhere (or
+    two digits forced into one cell) is a conflict.
+    Return (new trail top, consistent).
+    """
+    once = 0
+    twice = 0
+    for cell in unit:
+        mask = dom[cell]
+        twice |= once & mask
+        once |= mask
+    if once != FULL_MASK:
+        return top, False  # some digit has no place left in this unit
+
+    singles = once & ~twice
+    for cell in unit:
+        mask = dom[cell]
+        forced = mask & singles
+        if forced and forced != mask and not assigned[cell]:
+            if forced & (forced - 1):
+                return top, False
+            trail[2 * top] = cell
+            trail[2 * top + 1] = mask
+            top += 1
+            dom[cell] = forced
+    return top, True
+
+
+@njit(cache=True)
+def _clear_digits(dom, assigned, unit, trail, top, digits, keep):
+    """
+    Remove 'digits' from unassigned cells of the unit whose mask is not a
+    subset of 'keep'. Return (new trail top, consistent).
+    """
+    for cell in unit:
+        mask = dom[cell]
+        if mask & digits and mask & ~keep and not assigned[cell]:
+            trail[2 * top] = cell
+            trail[2 * top + 1] = mask
+            top += 1
+            mask &= ~digits
+            dom[cell] = mask
+            if mask == 0:
+                return top, False
+    return top, True
+
+
+@njit(cache=True)
+def _naked_subsets(dom, assigned, unit, trail, top):
+    """
+    Naked pairs and triples on one unit: when 2 (or 3) unassigned cells
+    only hold 2 (or 3) digits between them, those digits are theirs and
+    are removed from every other cell of the unit.
+    Return (new trail top, consistent).
+    """
+    n = len(unit)
+    for a in range(n):
+        mask_a = dom[unit[a]]
+        count_a = _popcount(mask_a)
+        if assigned[unit[a]] or count_a < 2 or count_a > 3:
+            continue
+        for b in range(a + 1, n):
+            if assigned[unit[b]]:
+                continue
+            pair = mask_a | dom[unit[b]]
+            count = _popcount(pair)
+            if count == 2:
+                top, consistent = _clear_digits(
+                    dom, assigned, unit, trail, top, pair, pair
+                )
+                if not consistent:
+                    return top, False
+            elif count == 3:
+                for c in range(b + 1, n):
+                    if assigned[unit[c]]:
+                        continue
+                    triple = pair | dom[unit[c]]
+                    if _popcount(triple) == 3:
+                        top, consistent = _clear_digits(
+                            dom, assigned, unit, trail, top, triple, triple
+                        )
+                        if not consistent:
+                            return top, False
+    return top, True
+
+
+@njit(cache=True)
+def _arc_consistency(dom, peers):
+    """
+    AC-3 for the Sudoku 'must differ' constraints, run once before search:
+    every cell down to one digit removes it from its peers, repeated until
+    nothing changes. Easy puzzles are fully solved here.
+    Return False if a domain is wiped out.
+    """
+    changed = True
+    while changed:
+        changed = False
+        for cell in range(len(dom)):
+            mask = dom[cell]
+            if mask == 0:
+                return False
+            if mask & (mask - 1) == 0:
+                for peer in peers[cell]:
+                    if dom[peer] & mask:
+                        dom[peer] ^= mask
+                        if dom[peer] == 0:
+                            return False
+                        changed = True
+    return True
+
+
+@njit(cache=True)
+def _solve(
+    dom,
+    peers,
+    units,
+    cell_units,
+    assigned,
+    frames,
+    trail,
+    last_tie,
+    value_order,
+    seed,
+    stop,
+):
+    """
+    Backtracking with MRV, forward checking, hidden singles and naked
+    pairs/triples on flat Sudoku masks.
+    Uses only ints and arrays so Numba can compile it: 'frames' holds
+    (cell, untried values, trail mark) per depth and 'trail' holds
+    (cell, old mask) pairs to restore when backing up.
+    MRV ties go to the last cell instead of the first when 'last_tie' is
+    set; 'value_order' is VALUE_LOW, VALUE_HIGH or VALUE_RANDOM (seeded
+    by 'seed'). The search gives up as soon as stop[0] is non-zero.
+    Return True when every mask is reduced to a single bit.
+    """
+    rng = (seed * 2654435761 + 1) & 0xFFFFFFFF
+    depth = 0
+    top = 0
+    while True:
+        if stop[0]:
+            return False  # another solver finished first
+
+        # MRV: unassigned cell with the fewest remaining values
+        cell = -1
+        best = 10
+        for i in range(len(dom)):
+            if not assigned[i]:
+                count = _popcount(dom[i])
+                if count < best or (last_tie and count == best):
+                    best = count
+                    cell = i
+                    if count <= 1 and not last_tie:
+                        break  # forced (or dead) cell, nothing beats it
+        if cell < 0:
+            return True  # assignment is complete
+
+        assigned[cell] = 1
+        frames[3 * depth] = cell
+        frames[3 * depth + 1] = dom[cell]
+        frames[3 * depth + 2] = top
+        depth += 1
+
+        # Try the next value of the deepest frame, backing up when exhausted
+        while True:
+            frame = 3 * (depth - 1)
+            cell = frames[frame]
+            # Undo assignment and inferences of the previous attempt
+            while top > frames[frame + 2]:
+                top -= 1
+                dom[trail[2 * top]] = trail[2 * top + 1]
+            untried = frames[frame + 1]
+            if untried == 0:
+                assigned[cell] = 0
+                depth -= 1
+                if depth == 0:
+                    return False  # failure
+                continue
+
+            if value_order == VALUE_LOW:
+                bit = untried & -untried
+            elif value_order == VALUE_HIGH:
+                bit = untried
+                while bit & (bit - 1):
+                    bit &= bit - 1
+            else:
+                # xorshift32 step, then take the (rng mod count)-th set bit
+                rng ^= (rng << 13) & 0xFFFFFFFF
+                rng ^= rng >> 17
+                rng ^= (rng << 5) & 0xFFFFFFFF
+                skip = rng % _popcount(untried)
+                rest = untried
+                bit = rest & -rest
+                while skip:
+                    rest ^= bit
+                    bit = rest & -rest
+                    skip -= 1
+            frames[frame + 1] = untried ^ bit
+            trail[2 * top] = cell
+            trail[2 * top + 1] = dom[cell]
+            top += 1
+            dom[cell] = bit
+
+            # Forward checking: clear bit from unassigned peers
+            consistent = True
+            for peer in peers[cell]:
+                mask = dom[peer]
+                if mask & bit and not assigned[peer]:
+                    trail[2 * top] = peer
+                    trail[2 * top + 1] = mask
+                    top += 1
+                    mask ^= bit
+                    dom[peer] = mask
+                    if mask == 0:
+                        consistent = False
+                        break
+            # Hidden singles and naked pairs/triples in the row, column and
+            # box of the assigned cell
+            if consistent:
+                for unit in cell_units[cell]:
+                    top, consistent = _hidden_singles(
+                        dom, assigned, units[unit], trail, top
+                    )
+                    if consistent:
+                        top, consistent = _naked_subsets(
+                            dom, assigned, units[unit], trail, top
+                        )
+                    if not consistent:
+                        break
+            if consistent:
+                break
+
+
+def _solve_grid(
+    grid: List[List[int]], last_tie: bool, value_order: int, seed: int, stop: Any
+) -> Optional[List[List[int]]]:
+    """Set up the mask arrays for 'grid', run one configuration of _solve"""
+    dom = _int_array(
+        [
+            1 << (grid[i][j] - 1) if grid[i][j] != 0 else FULL_MASK
+            for i in range(9)
+            for j in range(9)
+        ]
+    )
+    if not _arc_consistency(dom, SUDOKU_PEERS):
+        return None
+    assigned = _int_array([0] * 81)
+    frames = _int_array([0] * (3 * 81))
+    # Every trail entry but a cell's own assignment removes at least one of
+    # the 81 * 9 candidate bits, so one search path never needs more entries
+    trail = _int_array([0] * (2 * (81 * 9 + 81)))
+    if not _solve(
+        dom,
+        SUDOKU_PEERS,
+        SUDOKU_UNITS,
+        SUDOKU_CELL_UNITS,
+        assigned,
+        frames,
+        trail,
+        last_tie,
+        value_order,
+        seed,
+        stop,
+    ):
         return None
 
-    # Convert back to grid
-    result = [[0] * 9 for _ in range(9)]
-    for (i, j), val in solution.items():
-        result[i][j] = val
-    return result
+    # Convert back to grid: every mask is now a single bit
+    return [[int(dom[9 * i + j]).bit_length() for j in range(9)] for i in range(9)]
+
+
+def solve_sudoku(grid: List[List[int]]) -> Optional[List[List[int]]]:
+    """Solve a 9x9 Sudoku grid (0 = empty) using bitmask domains"""
+    return _solve_grid(grid, False, VALUE_LOW, 0, _int_array([0]))
+
+
+# ========================================
+# PARALLEL PORTFOLIO
+# ========================================
+
+# (MRV ties to the last cell, value order) per worker; the first entry is
+# the serial solve_sudoku search. Workers beyond these run more random
+# value orders, each with its own seed.
+PORTFOLIO = [
+    (False, VALUE_LOW),
+    (True, VALUE_HIGH),
+    (False, VALUE_RANDOM),
+    (True, VALUE_RANDOM),
+]
+
+_stop_flag = None  # per worker process, set by _init_portfolio_worker
+
+
+def _init_portfolio_worker(stop: Any):
+    global _stop_flag
+    _stop_flag = stop if np is None else np.frombuffer(stop, dtype=np.int32)
+
+
+def _portfolio_worker(
+    args: Tuple[List[List[int]], bool, int, int]
+) -> Optional[List[List[int]]]:
+    """Run the Sudoku kernel with one search configuration"""
+    grid, last_tie, value_order, seed = args
+    return _solve_grid(grid, last_tie, value_order, seed, _stop_flag)
+
+
+def _portfolio_tasks(
+    grid: List[List[int]], n_workers: int
+) -> List[Tuple[List[List[int]], bool, int, int]]:
+    """One task per worker: each deterministic configuration at most once"""
+    tasks = [
+        (grid, last_tie, value_order, k)
+        for k, (last_tie, value_order) in enumerate(PORTFOLIO[:n_workers])
+    ]
+    for k in range(len(PORTFOLIO), n_workers):
+        tasks.append((grid, k % 2 == 1, VALUE_RANDOM, k))
+    return tasks
+
+
+def solve_sudoku_parallel(
+    grid: List[List[int]], n_workers: int = 4
+) -> Optional[List[List[int]]]:
+    """
+    Race differently configured runs of the solve_sudoku kernel in separate
+    processes and return the first solution. The others poll a shared flag
+    once per search node and stop. Each process has its own arrays, so no
+    locking is needed. Starting the pool costs tens of milliseconds, so
+    this only pays off on puzzles where the serial search is slow.
+    """
+    stop = multiprocessing.RawArray("i", 1)
+    pool = multiprocessing.Pool(
+        n_workers, initializer=_init_portfolio_worker, initargs=(stop,)
+    )
+    try:
+        for result in pool.imap_unordered(
+            _portfolio_worker, _portfolio_tasks(grid, n_workers)
+        ):
+            if result is not None:
+                return result
+        return None
+    finally:
+        # Let the losers see the flag and exit on their own: terminate()
+        # can kill one while it holds the result queue's lock, and then
+        # the pool's shutdown blocks forever
+        stop[0] = 1
+        pool.close()
+        pool.join()
 
 
 # ========================================
@@ -169,15 +737,15 @@ if __name__ == "__main__":
         [0, 0, 0, 0, 8, 0, 0, 7, 9],
     ]
 
-    print("Puzzle:")
-    for row in puzzle:
-        print(row)
+    # Collect all output lines and write them in a single call
+    lines = ["Puzzle:"]
+    lines.extend(str(row) for row in puzzle)
 
     solution = solve_sudoku(puzzle)
 
-    print("\nSolution:")
+    lines.append("\nSolution:")
     if solution:
-        for row in solution:
-            print(row)
+        lines.extend(str(row) for row in solution)
     else:
-        print("No solution exists.")
+        lines.append("No solution exists.")
+    sys.stdout.write("\n".join(lines) + "\n")